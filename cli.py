@@ -1,4 +1,6 @@
 import argparse
+import signal
+import threading
 from scheduler.engine import SchedulerEngine
 
 engine = SchedulerEngine()
@@ -52,11 +54,17 @@ elif args.command == "list":
 
 elif args.command == "start":
     print("Starting scheduler... (Ctrl+C to stop)")
-    try:
-        engine.start()
-        import time
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nShutting down...")
-        engine.stop()
\ No newline at end of file
+    # Only flag the shutdown from the signal handler; engine.stop() then runs
+    # on the main thread and does the single final save after workers finish.
+    stop_evt = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_evt.set())
+    signal.signal(signal.SIGTERM, lambda *_: stop_evt.set())
+    engine.start()
+    # Wait in short slices: an untimed wait can't be interrupted by Ctrl+C on Windows
+    while not stop_evt.wait(1):
+        pass
+    # A second Ctrl+C force-quits if shutdown is stuck behind a long job or alarm
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    print("\nShutting down...")
+    engine.stop()
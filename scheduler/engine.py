@@ -1,16 +1,27 @@
+import datetime
+import itertools
 import threading
+from contextlib import contextmanager
 from scheduler.runner import JobRunner
-from scheduler.job_store import load_jobs
+from scheduler.job_store import load_jobs, save_jobs
 from scheduler.utils import parse_time, now
-from scheduler.recurrence import next_run_time
+from scheduler.recurrence import fixed_delta
 from scheduler.notifications import notify_scheduler_started, notify_scheduler_status, notify_scheduler_stopped
 
 class SchedulerEngine:
     def __init__(self):
-        self.jobs = load_jobs()
-        # Keep next_run as ISO format strings in the jobs list
+        # Jobs keyed by a per-process id so the runner's heap can carry ids and
+        # dispatch without scanning; names aren't unique, so they can't be the key
+        self._ids = itertools.count()
+        self.jobs_by_id = {}
+        for job in load_jobs():
+            job["_id"] = next(self._ids)
+            self.jobs_by_id[job["_id"]] = job
 
-        self.runner = JobRunner(self.jobs)
+        self.runner = JobRunner(self.jobs_by_id)
+        # Nesting depth of batch() blocks; saves are deferred while it is non-zero
+        self._batch_depth = 0
+        self._batch_dirty = False
         self.thread = None
         # Background status notifier
         self._status_thread = None
@@ -20,23 +31,57 @@ class SchedulerEngine:
         if rule["frequency"] == "interval":
             first_run = now()
         else:
-            # Handle HH:MM format by converting to today's date
             time_str = rule.get("time", "00:00")
             if "T" not in time_str:  # HH:MM format
-                today = now().date()
-                time_str = f"{today}T{time_str}:00"
-            first_run = parse_time(time_str)
+                # Build today's datetime directly instead of round-tripping through ISO
+                h, m = time_str.split(":")
+                first_run = datetime.datetime.combine(now().date(), datetime.time(int(h), int(m)))
+            else:
+                first_run = parse_time(time_str)
 
         job = {
             "name": name,
             "command": command,
             "rule": rule,
-            "next_run": first_run.isoformat()
+            "next_run": first_run.isoformat(),
+            "_next_run_ts": first_run.timestamp(),
+            "_delta_seconds": fixed_delta(rule),
         }
-        self.jobs.append(job)
+        job["_id"] = next(self._ids)
+        self.jobs_by_id[job["_id"]] = job
+        self.runner.schedule(job)
 
-        from scheduler.job_store import save_jobs
-        save_jobs(self.jobs)
+        if self._batch_depth > 0:
+            self._batch_dirty = True
+        else:
+            save_jobs(list(self.jobs_by_id.values()))
+
+    def begin_batch(self):
+        """Defer saving jobs until the matching end_batch()."""
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """Close a batch; the outermost one saves once if any job was added."""
+        if self._batch_depth == 0:
+            raise RuntimeError("end_batch() without begin_batch()")
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and self._batch_dirty:
+            save_jobs(list(self.jobs_by_id.values()))
+            self._batch_dirty = False
+
+    @contextmanager
+    def batch(self):
+        """Add several jobs with a single write at the end:
+
+            with engine.batch():
+                engine.add_job(...)
+                engine.add_job(...)
+        """
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
 
     def start(self):
         # Start runner thread
@@ -45,13 +90,13 @@ class SchedulerEngine:
 
         # Start status notifier thread
         self._status_running = True
-        notify_scheduler_started(len(self.jobs))
+        notify_scheduler_started(len(self.jobs_by_id))
 
         def _status_loop():
             # Periodically notify that scheduler is running (every 5 seconds)
             while self._status_running:
                 try:
-                    notify_scheduler_status(len(self.jobs))
+                    notify_scheduler_status(len(self.jobs_by_id))
                 except Exception:
                     pass
                 threading.Event().wait(5)
@@ -76,4 +121,4 @@ class SchedulerEngine:
             pass
 
     def list_jobs(self):
-        return self.jobs
\ No newline at end of file
+        return list(self.jobs_by_id.values())
\ No newline at end of file
@@ -1,12 +1,58 @@
 import json
+import os
+import tempfile
+import threading
 from pathlib import Path
+from scheduler.utils import parse_time
+from scheduler.recurrence import fixed_delta
 
 STORE_FILE = Path("jobs.json")
 
+# Runtime-only job keys, rebuilt on load; underscore-prefixed keys are skipped too
+TRANSIENT_KEYS = {"running"}
+
+# The flusher thread and add_job can both save; let them take turns
+_save_lock = threading.Lock()
+
 def load_jobs():
     if STORE_FILE.exists():
-        return json.loads(STORE_FILE.read_text())
+        jobs = json.loads(STORE_FILE.read_text(encoding="utf-8"))
+        # Backfill the cached epoch and delta so the runner never re-parses next_run
+        for job in jobs:
+            job["_next_run_ts"] = parse_time(job["next_run"]).timestamp()
+            job["_delta_seconds"] = fixed_delta(job["rule"])
+        return jobs
     return []
 
 def save_jobs(jobs):
-    STORE_FILE.write_text(json.dumps(jobs, indent=4))
\ No newline at end of file
+    data = [
+        {k: v for k, v in job.items() if not k.startswith("_") and k not in TRANSIENT_KEYS}
+        for job in jobs
+    ]
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+    # Write to a temp file and rename over the store so a crash never leaves it
+    # half-written. The temp name is unique so a second process (e.g. `cli.py add`
+    # while `cli.py start` is flushing) never writes into the same file.
+    with _save_lock:
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=STORE_FILE.parent,
+            prefix=STORE_FILE.name + ".",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            tmp = f.name
+            try:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+                # NamedTemporaryFile is created 0600; keep the store's usual mode
+                mode = STORE_FILE.stat().st_mode & 0o777 if STORE_FILE.exists() else 0o644
+                os.chmod(tmp, mode)
+            except BaseException:
+                f.close()
+                os.unlink(tmp)
+                raise
+        os.replace(tmp, STORE_FILE)
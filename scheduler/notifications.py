@@ -3,12 +3,25 @@ Notification and alarm module for scheduler jobs.
 Provides pop-up notifications, system notifications, and alarm sounds.
 """
 
+import functools
+import hashlib
 import os
+import shutil
+import subprocess
 import sys
 import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from scheduler.utils import log
+
+_PLAT = sys.platform
+
+if _PLAT == "win32":
+    import winsound
+
 # Suppress plyer-related warnings
 warnings.filterwarnings('ignore')
 
@@ -18,6 +31,54 @@ except (ImportError, ModuleNotFoundError):
     notification = None
 
 
+# Shared workers for sounds and popups so notifications don't spawn a thread each
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notify")
+
+# Repeat notifications for the same job within one bucket are suppressed
+DEDUP_BUCKET = 5
+# How long fingerprints are remembered (seconds)
+DEDUP_TTL = 60
+# Job start and alarm notifications arriving within this window are announced together
+BURST_WINDOW = 0.5
+
+_notify_lock = threading.Lock()
+_recent = {}
+# Pending burst items per kind ("execution", "alarm")
+_bursts = {}
+
+
+# Helper binaries, resolved once so each notification is a single exec with no shell
+AFPLAY = shutil.which("afplay")
+OSASCRIPT = shutil.which("osascript")
+PAPLAY = shutil.which("paplay")
+SPEAKER_TEST = shutil.which("speaker-test")
+BEEP = shutil.which("beep")
+
+
+def _spawn(argv, wait=False):
+    """Run a helper binary with its output discarded; skip it if not installed."""
+    if not argv[0]:
+        return
+    proc = subprocess.Popen(
+        argv,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+    )
+    if wait:
+        proc.wait()
+
+
+def _applescript_string(text):
+    """Quote text as an AppleScript string literal."""
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _display_notification(title, message):
+    script = f"display notification {_applescript_string(message)} with title {_applescript_string(title)}"
+    _spawn([OSASCRIPT, "-e", script])
+
+
 # Available system sounds on macOS
 MACOS_SOUNDS = {
     "alarm": "/System/Library/Sounds/Sosumi.aiff",  # Loud buzzer
@@ -30,74 +91,130 @@ MACOS_SOUNDS = {
     "success": "/System/Library/Sounds/Tink.aiff",
 }
 
+# Ready-to-run afplay argv per sound type, only for sounds present on this machine
+SOUND_ARGV = {
+    kind: [AFPLAY, path]
+    for kind, path in MACOS_SOUNDS.items()
+    if AFPLAY and os.path.exists(path)
+}
 
-def play_notification_sound(sound_type="notification"):
-    """
-    Play a notification sound based on type.
-    
-    Args:
-        sound_type (str): Type of sound - 'alarm', 'notification', 'alert', etc.
-    """
+
+def _play_notification_darwin(sound_type="notification"):
+    """Play a macOS system sound; 'alarm' plays a loud buzzer burst."""
     try:
-        if sys.platform == "darwin":  # macOS
-            sound_file = MACOS_SOUNDS.get(sound_type, MACOS_SOUNDS["notification"])
-            # Play loud buzzer effect for alarm
-            if sound_type == "alarm":
-                import time as time_mod
-                for _ in range(6):
-                    os.system(f"afplay {sound_file} > /dev/null 2>&1 &")
-                    time_mod.sleep(0.2)
-                # Also play Basso for extra buzzer
+        argv = SOUND_ARGV.get(sound_type) or SOUND_ARGV.get("notification")
+        if not argv:
+            return
+        # Play loud buzzer effect for alarm
+        if sound_type == "alarm":
+            for _ in range(6):
+                _spawn(argv)
+                time.sleep(0.2)
+            # Also play Basso for extra buzzer
+            buzzer = SOUND_ARGV.get("buzzer")
+            if buzzer:
                 for _ in range(2):
-                    os.system(f"afplay {MACOS_SOUNDS['buzzer']} > /dev/null 2>&1 &")
-                    time_mod.sleep(0.2)
-            else:
-                os.system(f"afplay {sound_file} > /dev/null 2>&1 &")
-        elif sys.platform == "win32":  # Windows
-            import winsound
-            # Play default Windows sound
-            winsound.MessageBeep()
-        elif sys.platform == "linux":  # Linux
-            # Use paplay or aplay if available
-            os.system("paplay /usr/share/sounds/freedesktop/stereo/complete.oga 2>/dev/null &")
+                    _spawn(buzzer)
+                    time.sleep(0.2)
+        else:
+            _spawn(argv)
     except Exception as e:
         pass  # Silently fail if sound unavailable
 
 
-def play_alarm_sound(duration=3):
-    """
-    Play a system beep/alarm sound for the specified duration.
-    
-    Args:
-        duration (int): Duration of the alarm in seconds
-    """
+def _play_notification_win32(sound_type="notification"):
+    """Play the default Windows message sound."""
+    try:
+        winsound.MessageBeep()
+    except Exception as e:
+        pass  # Silently fail if sound unavailable
+
+
+def _play_notification_linux(sound_type="notification"):
+    """Play the freedesktop completion sound through paplay if available."""
+    try:
+        _spawn([PAPLAY, "/usr/share/sounds/freedesktop/stereo/complete.oga"])
+    except Exception as e:
+        pass  # Silently fail if sound unavailable
+
+
+def _play_alarm_darwin(duration=3):
+    """Play a double "beep beep" pattern with the macOS Beep sound for `duration` seconds."""
+    try:
+        argv = SOUND_ARGV.get("beep")
+        if not argv:
+            return
+        # For each second, play two short beeps
+        end_time = time.time() + max(0, int(duration))
+        while time.time() < end_time:
+            # first beep
+            _spawn(argv, wait=True)
+            time.sleep(0.18)
+            # second beep
+            _spawn(argv, wait=True)
+            # short pause before next pair
+            time.sleep(0.32)
+    except Exception as e:
+        pass  # Silently fail if sound unavailable
+
+
+def _play_alarm_win32(duration=3):
+    """Sound a 1 kHz Windows beep for `duration` seconds."""
     try:
-        if sys.platform == "darwin":  # macOS
-                # Play a simple double "beep beep" pattern using the system Beep sound
-                # This will play two quick beeps repeatedly for the requested duration
-                import time as time_mod
-                beep_file = MACOS_SOUNDS.get("beep", "/System/Library/Sounds/Beep.aiff")
-                # For each second, play two short beeps
-                end_time = time_mod.time() + max(0, int(duration))
-                while time_mod.time() < end_time:
-                    # first beep
-                    os.system(f"afplay {beep_file} > /dev/null 2>&1")
-                    time_mod.sleep(0.18)
-                    # second beep
-                    os.system(f"afplay {beep_file} > /dev/null 2>&1")
-                    # short pause before next pair
-                    time_mod.sleep(0.32)
-        elif sys.platform == "win32":  # Windows
-            # Use Windows beep
-            import winsound
-            winsound.Beep(1000, int(duration * 1000))
-        elif sys.platform == "linux":  # Linux
-            # Use beep command or speaker-test
-            os.system(f"(speaker-test -t sine -f 1000 -l 1 2>/dev/null || beep) &")
+        winsound.Beep(1000, int(duration * 1000))
     except Exception as e:
         pass  # Silently fail if sound unavailable
 
 
+def _play_alarm_linux(duration=3):
+    """Sound a tone with speaker-test, falling back to the beep command."""
+    try:
+        if SPEAKER_TEST:
+            _spawn([SPEAKER_TEST, "-t", "sine", "-f", "1000", "-l", "1"])
+        else:
+            _spawn([BEEP])
+    except Exception as e:
+        pass  # Silently fail if sound unavailable
+
+
+def _no_sound(*args, **kwargs):
+    """Sound is not supported on this platform."""
+
+
+# Bind the public sound functions to this platform's implementation once, at import.
+# play_notification_sound(sound_type="notification") and play_alarm_sound(duration=3)
+# keep their original signatures.
+play_notification_sound = {
+    "darwin": _play_notification_darwin,
+    "win32": _play_notification_win32,
+    "linux": _play_notification_linux,
+}.get(_PLAT, _no_sound)
+
+play_alarm_sound = {
+    "darwin": _play_alarm_darwin,
+    "win32": _play_alarm_win32,
+    "linux": _play_alarm_linux,
+}.get(_PLAT, _no_sound)
+
+
+def _notify_macos(title, message, timeout=10):
+    # Always use osascript for macOS notification popups
+    _display_notification(title, message)
+
+
+def _notify_terminal(title, message, timeout=10):
+    log.info(f"\n🔔 {title}\n   {message}")
+
+
+# Pick the popup backend once so each popup is a direct call
+if _PLAT == "darwin":
+    _notify = _notify_macos
+elif notification:
+    _notify = functools.partial(notification.notify, app_name="Scheduler")
+else:
+    _notify = _notify_terminal
+
+
 def show_popup_notification(title, message, timeout=10):
     """
     Show a system pop-up notification.
@@ -108,22 +225,7 @@ def show_popup_notification(title, message, timeout=10):
         timeout (int): Timeout in seconds (default 10)
     """
     try:
-        if sys.platform == "darwin":
-            # Always use osascript for macOS notification popups
-            safe_message = message.replace('"', '\"')
-            safe_title = title.replace('"', '\"')
-            script = f'display notification "{safe_message}" with title "{safe_title}"'
-            os.system(f"osascript -e '{script}' &")
-        elif notification:
-            notification.notify(
-                title=title,
-                message=message,
-                timeout=timeout,
-                app_name="Scheduler",
-            )
-        else:
-            print(f"\n🔔 {title}")
-            print(f"   {message}")
+        _notify(title=title, message=message, timeout=timeout)
     except Exception as e:
         # Silently fail for notification popup
         pass
@@ -139,18 +241,59 @@ def show_popup_window(title, message):
         message (str): Message content
     """
     try:
-        if sys.platform == "darwin":  # macOS
+        if _PLAT == "darwin":  # macOS
             # Use osascript for native macOS notification
-            # Escape quotes in the message
-            safe_message = message.replace('"', '\\"')
-            safe_title = title.replace('"', '\\"')
-            script = f'display notification "{safe_message}" with title "{safe_title}"'
-            os.system(f'osascript -e \'{script}\' &')
+            _display_notification(title, message)
         else:
             # Show notification through plyer
             show_popup_notification(title, message)
     except Exception as e:
-        print(f"Could not show pop-up: {e}")
+        log.warning(f"Could not show pop-up: {e}")
+
+
+def _seen_recently(kind, job_name):
+    """Record a (kind, job, time bucket) fingerprint; True if it was already seen."""
+    ts = time.time()
+    fp = hashlib.blake2b(f"{kind}|{job_name}|{ts // DEDUP_BUCKET}".encode(), digest_size=8).digest()
+    with _notify_lock:
+        for old_fp, seen in list(_recent.items()):
+            if ts - seen > DEDUP_TTL:
+                del _recent[old_fp]
+        if fp in _recent:
+            return True
+        _recent[fp] = ts
+        return False
+
+
+def _buffer_burst(kind, item, announce):
+    """Queue item; the first of a burst schedules one task that announces them all."""
+    with _notify_lock:
+        pending = _bursts.setdefault(kind, [])
+        pending.append(item)
+        first = len(pending) == 1
+    if first:
+        _pool.submit(_flush_burst, kind, announce)
+
+
+def _flush_burst(kind, announce):
+    # Let the rest of a burst (e.g. a backlog drain) arrive first
+    time.sleep(BURST_WINDOW)
+    with _notify_lock:
+        burst = _bursts.pop(kind, [])
+    announce(burst)
+
+
+def _announce_executions(burst):
+    names = [name for name, _, _ in burst]
+    if len(names) == 1:
+        message = f"Job '{names[0]}' is now running"
+    else:
+        message = f"{len(names)} jobs fired: {', '.join(names)}"
+
+    if any(with_popup for _, _, with_popup in burst):
+        show_popup_window("Job Execution", message)
+    if any(with_sound for _, with_sound, _ in burst):
+        play_notification_sound("alarm")
 
 
 def notify_job_execution(job_name, with_sound=True, with_popup=True):
@@ -162,24 +305,12 @@ def notify_job_execution(job_name, with_sound=True, with_popup=True):
         with_sound (bool): Whether to play alarm sound
         with_popup (bool): Whether to show pop-up notification
     """
-    print(f"\n⏰ JOB ALERT: {job_name}")
-    
-    if with_sound:
-        # Play notification sound in background thread so it doesn't block execution
-        sound_thread = threading.Thread(
-            target=play_notification_sound, 
-            args=("alarm",),
-            daemon=True
-        )
-        sound_thread.start()
-    
-    if with_popup:
-        notification_thread = threading.Thread(
-            target=show_popup_window,
-            args=(f"Job Execution", f"Job '{job_name}' is now running"),
-            daemon=True
-        )
-        notification_thread.start()
+    log.info(f"\n⏰ JOB ALERT: {job_name}")
+
+    if not (with_sound or with_popup) or _seen_recently("execution", job_name):
+        return
+
+    _buffer_burst("execution", (job_name, with_sound, with_popup), _announce_executions)
 
 
 def notify_job_completed(job_name, next_run_time):
@@ -198,12 +329,7 @@ def notify_job_completed(job_name, next_run_time):
     )
     
     # Play a success/completion sound in background
-    sound_thread = threading.Thread(
-        target=play_notification_sound,
-        args=("success",),
-        daemon=True
-    )
-    sound_thread.start()
+    _pool.submit(play_notification_sound, "success")
 
 
 def show_alert_dialog(job_name, message=""):
@@ -216,30 +342,19 @@ def show_alert_dialog(job_name, message=""):
         message (str): Additional alert message
     """
     try:
-        if sys.platform == "darwin":  # macOS
-            # Create an interactive alert dialog
-            alert_text = f"🚨 ALARM: {job_name}"
-            if message:
-                alert_text += f"\n\n{message}"
-            
-            safe_text = alert_text.replace('"', '\\"').replace("'", "\\'")
-            
-            # Use AppleScript to show an alert dialog
+        if _PLAT == "darwin":  # macOS
+            # Use AppleScript to show an interactive alert dialog
             script = f'''
             tell application "System Events"
-                display alert "{job_name}" message "{message}" buttons {{"Dismiss", "Snooze"}} default button 1 with icon caution
+                display alert {_applescript_string(job_name)} message {_applescript_string(message)} buttons {{"Dismiss", "Snooze"}} default button 1 with icon caution
             end tell
             '''
-            os.system(f"osascript -e '{script}' > /dev/null 2>&1 &")
+            _spawn([OSASCRIPT, "-e", script])
         else:
             # Fallback for Windows/Linux
-            print(f"\n🚨 ALERT: {job_name}")
-            if message:
-                print(f"   {message}")
+            log.info(f"\n🚨 ALERT: {job_name}" + (f"\n   {message}" if message else ""))
     except Exception as e:
-        print(f"\n🚨 ALERT: {job_name}")
-        if message:
-            print(f"   {message}")
+        log.info(f"\n🚨 ALERT: {job_name}" + (f"\n   {message}" if message else ""))
 
 
 def notify_alarm_ringing(job_name, duration=5):
@@ -251,31 +366,28 @@ def notify_alarm_ringing(job_name, duration=5):
         job_name (str): Name of the alarm job
         duration (int): Duration to play alarm sound (seconds)
     """
-    print(f"\n🔔🔔🔔 ALARM RINGING: {job_name} 🔔🔔🔔")
-    
-    # Show alert dialog in background thread
-    alert_thread = threading.Thread(
-        target=show_alert_dialog,
-        args=(job_name, "Your scheduled alarm has been triggered!"),
-        daemon=True
-    )
-    alert_thread.start()
-    
-    # Play alarm sound in background thread
-    alarm_thread = threading.Thread(
-        target=play_alarm_sound,
-        args=(duration,),
-        daemon=True
-    )
-    alarm_thread.start()
+    log.info(f"\n🔔🔔🔔 ALARM RINGING: {job_name} 🔔🔔🔔")
+
+    # Don't stack dialogs and sounds for an alarm that is already ringing
+    if _seen_recently("alarm", job_name):
+        return
     
-    # Show popup notification
-    popup_thread = threading.Thread(
-        target=show_popup_notification,
-        args=(f"⏰ {job_name}", "Alarm is ringing!", duration),
-        daemon=True
-    )
-    popup_thread.start()
+    _buffer_burst("alarm", (job_name, duration), _ring_alarms)
+
+
+def _ring_alarms(burst):
+    # One dialog, popup and sound for every alarm in the burst; the dialog and
+    # popup return immediately, the sound blocks for the longest duration
+    names = [name for name, _ in burst]
+    duration = max(d for _, d in burst)
+    if len(names) == 1:
+        show_alert_dialog(names[0], "Your scheduled alarm has been triggered!")
+        show_popup_notification(f"⏰ {names[0]}", "Alarm is ringing!", duration)
+    else:
+        fired = f"{len(names)} alarms fired: {', '.join(names)}"
+        show_alert_dialog(f"{len(names)} alarms", fired)
+        show_popup_notification("⏰ Alarms", fired, duration)
+    play_alarm_sound(duration)
 
 
 def notify_scheduler_started(job_count: int):
@@ -289,8 +401,8 @@ def notify_scheduler_started(job_count: int):
         title = "Scheduler Started"
         message = f"Scheduler is running with {job_count} jobs."
         # Short popup and a light sound
-        threading.Thread(target=show_popup_notification, args=(title, message, 4), daemon=True).start()
-        threading.Thread(target=play_notification_sound, args=("pop",), daemon=True).start()
+        _pool.submit(show_popup_notification, title, message, 4)
+        _pool.submit(play_notification_sound, "pop")
     except Exception:
         pass
 
@@ -306,7 +418,7 @@ def notify_scheduler_status(job_count: int):
         title = "Scheduler Status"
         message = f"Running — {job_count} jobs scheduled."
         # Use a subtle popup to avoid being too noisy
-        threading.Thread(target=show_popup_notification, args=(title, message, 3), daemon=True).start()
+        _pool.submit(show_popup_notification, title, message, 3)
     except Exception:
         pass
 
@@ -318,7 +430,7 @@ def notify_scheduler_stopped():
     try:
         title = "Scheduler Stopped"
         message = "Scheduler has been stopped."
-        threading.Thread(target=show_popup_notification, args=(title, message, 4), daemon=True).start()
-        threading.Thread(target=play_notification_sound, args=("success",), daemon=True).start()
+        _pool.submit(show_popup_notification, title, message, 4)
+        _pool.submit(play_notification_sound, "success")
     except Exception:
         pass
@@ -1,12 +1,24 @@
 import datetime
 
+# Frequencies that always advance by the same wall-clock-independent span
+FIXED_DELTAS = {
+    "hourly": datetime.timedelta(hours=1).total_seconds(),
+}
+
+def fixed_delta(rule):
+    """Seconds between runs for fixed-span rules, or None for calendar rules."""
+    if rule["frequency"] == "interval":
+        return float(rule["seconds"])
+    return FIXED_DELTAS.get(rule["frequency"])
+
 def next_run_time(rule, last_run):
     freq = rule["frequency"]
 
     if freq == "once":
         time_str = rule["time"]
         if "T" not in time_str:  # HH:MM format
-            time_str = f"{last_run.date()}T{time_str}:00"
+            h, m = map(int, time_str.split(":"))
+            return datetime.datetime.combine(last_run.date(), datetime.time(h, m))
         return datetime.datetime.fromisoformat(time_str)
 
     if freq == "daily":
@@ -1,60 +1,177 @@
+import datetime
+import heapq
+import queue
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from scheduler.recurrence import next_run_time
 from scheduler.job_store import save_jobs
-from scheduler.utils import now, parse_time
-from scheduler.notifications import notify_job_execution, notify_job_completed, notify_alarm_ringing
+from scheduler.utils import parse_time, log
+from scheduler.notifications import notify_job_completed, notify_alarm_ringing
+
+# Upper bound on a single wait. The monotonic clock, and so Event.wait timeouts,
+# stop during system suspend, so this also bounds how late a job rings after
+# a resume before the loop notices the wall clock moved on.
+MAX_WAIT = 10
+# Wall/monotonic offset change (seconds) that triggers rebuilding the heap
+CLOCK_DRIFT = 1
+# Seconds to coalesce job state changes before writing them to disk
+FLUSH_INTERVAL = 1
+# Upper bound on jobs executing at the same time
+MAX_WORKERS = 8
 
 class JobRunner:
-    def __init__(self, jobs):
-        self.jobs = jobs
+    def __init__(self, jobs_by_id):
+        self.jobs_by_id = jobs_by_id
         self.running = True
-        self.lock = threading.Lock()
-        self.worker_threads = []
+        self.pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+        # Wakes the main loop early on stop() or when a job is (re)scheduled
+        self._wakeup = threading.Event()
+        # Wall-clock epochs are mapped onto time.monotonic() against this anchor so
+        # the loop compares plain floats. Wall time still decides when a job is due:
+        # after a suspend or a clock step the loop re-anchors and rebuilds the heap.
+        self._mono0 = time.monotonic()
+        self._wall0 = time.time()
+        # Min-heap of (monotonic_deadline, job_id), owned by the start() loop alone
+        self._heap = [(self._deadline(job), job_id) for job_id, job in self.jobs_by_id.items()]
+        heapq.heapify(self._heap)
+        # Workers and add_job hand (re)scheduled job ids to the loop through here;
+        # the loop computes deadlines itself since it alone owns the anchor
+        self._ready = queue.SimpleQueue()
+        # Set whenever job state changes; the flusher batches writes behind it
+        self._dirty = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        # start() is the only caller of pool.submit, so it also shuts the pool down;
+        # stop() waits on this instead of racing the loop with its own shutdown
+        self._loop_started = False
+        self._loop_done = threading.Event()
 
     def run_job(self, job):
-        print(f"\n▶ Running job: {job['name']}")
-        
+        log.info(f"\n▶ Running job: {job['name']}")
+
         # Trigger comprehensive alarm notification with alert dialog, sound, and popup
         notify_alarm_ringing(job['name'], duration=3)
 
         # simulate job execution
         time.sleep(2)
-        print(f"✔ Completed job: {job['name']}")
+        log.info(f"✔ Completed job: {job['name']}")
+
+    def _deadline(self, job):
+        return self._mono0 + (job["_next_run_ts"] - self._wall0)
+
+    def schedule(self, job):
+        """Add a job put in jobs_by_id after the runner was created."""
+        self._ready.put(job["_id"])
+        self._wakeup.set()
+
+    def _reanchor_if_drifted(self):
+        """Rebuild the heap if the wall clock moved relative to the monotonic one."""
+        mono, wall = time.monotonic(), time.time()
+        if abs((wall - mono) - (self._wall0 - self._mono0)) < CLOCK_DRIFT:
+            return
+        self._mono0, self._wall0 = mono, wall
+        self._heap = [(self._deadline(self.jobs_by_id[job_id]), job_id) for _, job_id in self._heap]
+        heapq.heapify(self._heap)
+
+    def _flush_loop(self):
+        while self.running:
+            self._dirty.wait()
+            if not self.running:
+                break
+            # Let a burst of reschedules land before writing once
+            time.sleep(FLUSH_INTERVAL)
+            if not self.running:
+                # stop() does the final save
+                break
+            self._dirty.clear()
+            try:
+                save_jobs(list(self.jobs_by_id.values()))
+            except Exception as e:
+                # Keep flushing; the next change or stop() retries the save
+                log.warning(f"Could not save jobs: {e}")
+
+    def sync(self):
+        """Write job state to disk now instead of waiting for the flusher."""
+        self._dirty.clear()
+        save_jobs(list(self.jobs_by_id.values()))
 
     def start(self):
-        print("Scheduler started...")
+        self._loop_started = True
+        try:
+            self._run_loop()
+        finally:
+            # Wait for in-flight jobs to complete
+            self.pool.shutdown(wait=True)
+            self._loop_done.set()
+
+    def _run_loop(self):
+        log.info("Scheduler started...")
+        self._flusher.start()
         while self.running:
-            with self.lock:
-                for job in self.jobs:
-                    t = now()
-                    # Parse the next_run string to datetime for comparison
-                    next_time = parse_time(job["next_run"])
-
-                    if t >= next_time and not job.get("running", False):
-                        job["running"] = True
-                        thread = threading.Thread(target=self.execute_and_reschedule, args=(job,), daemon=False)
-                        self.worker_threads.append(thread)
-                        thread.start()
-            time.sleep(1)
+            while not self._ready.empty():
+                job_id = self._ready.get_nowait()
+                heapq.heappush(self._heap, (self._deadline(self.jobs_by_id[job_id]), job_id))
+
+            self._reanchor_if_drifted()
+
+            # Pop everything already due in one pass so a backlog drains without
+            # going back through the wait between fires
+            now_mono = time.monotonic()
+            due = []
+            while self._heap and self._heap[0][0] <= now_mono:
+                due.append(heapq.heappop(self._heap))
+
+            if due:
+                for _, job_id in due:
+                    if not self.running:
+                        # Leave the rest unfired; they stay due on the next start
+                        break
+                    self.pool.submit(self.execute_and_reschedule, self.jobs_by_id[job_id])
+                continue
+
+            if self._heap:
+                self._wakeup.wait(timeout=min(self._heap[0][0] - now_mono, MAX_WAIT))
+            else:
+                self._wakeup.wait()
+            self._wakeup.clear()
 
     def execute_and_reschedule(self, job):
         self.run_job(job)
-        job["running"] = False
 
-        # Parse the string to datetime for recurrence calculation
-        last_run = parse_time(job["next_run"])
-        job["next_run"] = next_run_time(job["rule"], last_run).isoformat()
+        last_ts = job["_next_run_ts"]
+        if job["_delta_seconds"] is not None:
+            # Fixed-span rules advance on floats; datetime is only built for display
+            job["_next_run_ts"] = last_ts + job["_delta_seconds"]
+            job["next_run"] = datetime.datetime.fromtimestamp(job["_next_run_ts"]).isoformat()
+        else:
+            # Calendar rules (once/daily/weekly) keep wall-clock time across DST
+            next_run = next_run_time(job["rule"], parse_time(job["next_run"]))
+            job["next_run"] = next_run.isoformat()
+            job["_next_run_ts"] = next_run.timestamp()
+
+        # One-off jobs resolve to the same time again; don't fire them twice
+        if job["_next_run_ts"] > last_ts:
+            self._ready.put(job["_id"])
+            self._wakeup.set()
 
         # Notify job completion with next run time
         notify_job_completed(job['name'], job["next_run"])
 
-        save_jobs(self.jobs)
+        self._dirty.set()
 
     def stop(self):
-        print("Shutting down scheduler...")
+        log.info("Shutting down scheduler...")
         self.running = False
-        # Wait for all worker threads to complete
-        for thread in self.worker_threads:
-            if thread.is_alive():
-                thread.join(timeout=5)
\ No newline at end of file
+        self._wakeup.set()
+        if self._loop_started:
+            # The loop exits, then shuts the pool down once in-flight jobs finish
+            self._loop_done.wait()
+        else:
+            self.pool.shutdown(wait=True)
+
+        # Wake the flusher so it exits, then persist whatever is left
+        self._dirty.set()
+        if self._flusher.ident is not None:
+            self._flusher.join()
+        self.sync()
+
@@ -1,7 +1,26 @@
+import atexit
 import datetime
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+# Scheduler output goes through a queue so callers on the fire path only enqueue;
+# a background listener does the formatting and stdout writes.
+_log_queue = queue.Queue(-1)
+_console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter("%(message)s"))
+_listener = QueueListener(_log_queue, _console)
+_listener.start()
+atexit.register(_listener.stop)
+
+log = logging.getLogger("scheduler")
+log.setLevel(logging.INFO)
+log.addHandler(QueueHandler(_log_queue))
+log.propagate = False
 
 def now():
     return datetime.datetime.now()
 
 def parse_time(s):
-    return datetime.datetime.fromisoformat(s)
\ No newline at end of file
+    return datetime.datetime.fromisoformat(s)